@@ -4,13 +4,15 @@ Handles streaming and non-streaming chat requests.
 """
 
 import os
-import json
+import asyncio
+
+import orjson
 from typing import AsyncGenerator
-from httpx import AsyncClient
 
 from fastapi import HTTPException
 from image_handler import save_base64_image, call_chat_completion_with_image, delete_image
 from context_injector import ContextInjector
+from http_client import get_http_client
 
 # Configuration from app.py (will be imported)
 CLAWDBOT_BASE_URL = os.getenv("CLAWDBOT_BASE_URL", "http://localhost:18789")
@@ -19,10 +21,20 @@ CLAWDBOT_TOKEN = os.getenv("CLAWDBOT_TOKEN", "355fc5e1f0d6078a8a9a56f684d551d803
 # Get singleton instance (no more duplicate ContextInjector instances)
 context_injector = ContextInjector()
 
+# Pre-encoded SSE framing
+SSE_DATA_PREFIX = b"data: "
+SSE_EVENT_END = b"\n\n"
+SSE_DONE = b"data: [DONE]\n\n"
 
-async def generate_sse_stream(request, session_id, user_content):
+
+def _sse_event(payload: dict) -> bytes:
+    """Frame a JSON payload as an SSE data event."""
+    return SSE_DATA_PREFIX + orjson.dumps(payload) + SSE_EVENT_END
+
+
+async def _generate_sse_events(request, session_id, user_content):
     """
-    Generate SSE stream for chat responses.
+    Generate SSE events for chat responses along with their streamed text.
 
     Args:
         request: ChatRequest with image
@@ -30,11 +42,15 @@ async def generate_sse_stream(request, session_id, user_content):
         user_content: User message content
 
     Yields:
-        SSE formatted strings
+        (event, delta) tuples: the SSE formatted bytes and the assistant text
+        delta it carries (None for non-delta events)
     """
     if request.image:
         # Handle image-based chat (non-streaming but wrapped in SSE)
-        public_path, workspace_path, http_url = save_base64_image(request.image, session_id)
+        # Decoding and writing the image is blocking work; keep it off the event loop
+        public_path, workspace_path, http_url = await asyncio.to_thread(
+            save_base64_image, request.image, session_id
+        )
 
         result = await call_chat_completion_with_image(
             workspace_path,
@@ -43,13 +59,10 @@ async def generate_sse_stream(request, session_id, user_content):
         )
 
         assistant_content = result.get('choices', [{}])[0].get('message', {}).get('content', 'No response from assistant')
-        delete_image(public_path)
+        await asyncio.to_thread(delete_image, public_path)
 
-        event_data = json.dumps({
-            'choices': [{'message': {'content': assistant_content}}]
-        })
-        yield f"data: {event_data}\n\n"
-        yield "data: [DONE]\n\n"
+        yield _sse_event({'choices': [{'message': {'content': assistant_content}}]}), None
+        yield SSE_DONE, None
         return
 
     # Handle text-based streaming chat
@@ -58,20 +71,15 @@ async def generate_sse_stream(request, session_id, user_content):
         # Format: "adapter-session-{session_key}"
         user_field = f"adapter-session-{request.session_key}"
 
-        # Debug logging to verify correct format
-
         # Inject system context (project path + rules)
         user_messages = [{"role": "user", "content": user_content}]
-        messages_with_context = context_injector.inject_system_context(
+        # Context lookup hits the database and disk, so keep it off the event loop
+        messages_with_context = await asyncio.to_thread(
+            context_injector.inject_system_context,
             request.session_key,
             user_messages
         )
 
-        # Debug: Log the messages being sent
-        for i, msg in enumerate(messages_with_context):
-            role = msg.get("role", "unknown")
-            content_preview = msg.get("content", "")[:100]
-
         request_body = {
             "model": "agent:main",
             "user": user_field,
@@ -83,41 +91,56 @@ async def generate_sse_stream(request, session_id, user_content):
             "Authorization": f"Bearer {CLAWDBOT_TOKEN}",
         }
 
-        async with AsyncClient(timeout=300) as client:
-            async with client.stream(
-                'POST',
-                f"{CLAWDBOT_BASE_URL}/v1/chat/completions",
-                json=request_body,
-                headers=headers
-            ) as stream_response:
-                async for line in stream_response.aiter_lines():
-                    if not line.strip():
+        client = get_http_client()
+        async with client.stream(
+            'POST',
+            f"{CLAWDBOT_BASE_URL}/v1/chat/completions",
+            json=request_body,
+            headers=headers
+        ) as stream_response:
+            async for line in stream_response.aiter_lines():
+                if not line.strip():
+                    continue
+
+                if line.startswith('data: '):
+                    data = line[6:]
+
+                    if data.strip() == '[DONE]':
+                        yield SSE_DONE, None
+                        break
+
+                    try:
+                        parsed = orjson.loads(data)
+
+                        if parsed.get('choices') and parsed['choices']:
+                            delta = parsed['choices'][0].get('delta', {})
+
+                            if delta.get('content'):
+                                content = delta['content']
+                                yield _sse_event({'choices': [{'delta': {'content': content}}]}), content
+                    except:
                         continue
 
-                    if line.startswith('data: '):
-                        data = line[6:]
-
-                        if data.strip() == '[DONE]':
-                            yield "data: [DONE]\n\n"
-                            break
+    except Exception as e:
+        error_msg = f"Error: {str(e)}"
+        yield _sse_event({'choices': [{'message': error_msg}]}), None
+        yield SSE_DONE, None
 
-                        try:
-                            parsed = json.loads(data)
 
-                            if parsed.get('choices') and parsed['choices']:
-                                delta = parsed['choices'][0].get('delta', {})
+async def generate_sse_stream(request, session_id, user_content):
+    """
+    Generate SSE stream for chat responses.
 
-                                if delta.get('content'):
-                                    event_data = json.dumps({'choices': [{'delta': {'content': delta['content']}}]})
-                                    yield f"data: {event_data}\n\n"
-                        except:
-                            continue
+    Args:
+        request: ChatRequest with image
+        session_id: Session ID for image storage
+        user_content: User message content
 
-    except Exception as e:
-        error_msg = f"Error: {str(e)}"
-        event_data = json.dumps({'choices': [{'message': error_msg}]})
-        yield f"data: {event_data}\n\n"
-        yield "data: [DONE]\n\n"
+    Yields:
+        SSE formatted chunks, pre-encoded as UTF-8 bytes
+    """
+    async for event, _ in _generate_sse_events(request, session_id, user_content):
+        yield event
 
 
 async def handle_chat_with_image(request, session_id, user_content):
@@ -133,7 +156,10 @@ async def handle_chat_with_image(request, session_id, user_content):
         Assistant response content string
     """
     try:
-        public_path, workspace_path, http_url = save_base64_image(request.image, session_id)
+        # Decoding and writing the image is blocking work; keep it off the event loop
+        public_path, workspace_path, http_url = await asyncio.to_thread(
+            save_base64_image, request.image, session_id
+        )
 
         # Inject system context for image chat
         # Note: call_chat_completion_with_image handles the actual API call
@@ -145,7 +171,7 @@ async def handle_chat_with_image(request, session_id, user_content):
         )
 
         assistant_content = result.get('choices', [{}])[0].get('message', {}).get('content', 'No response from assistant')
-        delete_image(public_path)
+        await asyncio.to_thread(delete_image, public_path)
 
         return assistant_content
     except Exception as e:
@@ -162,7 +188,7 @@ async def generate_sse_stream_with_db_save(request, session_id, user_content):
         user_content: User message content
 
     Yields:
-        SSE formatted strings
+        SSE formatted chunks, pre-encoded as UTF-8 bytes
 
     Returns:
         None (saves to database automatically)
@@ -170,33 +196,26 @@ async def generate_sse_stream_with_db_save(request, session_id, user_content):
     # Import database here to avoid circular import
     from database_adapter import get_db
 
-    assistant_content = ""
-
-    async for chunk in generate_sse_stream(request, session_id, user_content):
-        # Extract content from SSE chunks
-        if chunk.startswith('data: {'):
-            data = chunk[6:]
-            if data.strip() != '[DONE]':
-                try:
-                    parsed = json.loads(data)
-                    if parsed.get('choices') and parsed['choices']:
-                        delta = parsed['choices'][0].get('delta', {})
-                        content = delta.get('content', '')
-                        if content:
-                            assistant_content += content
-                except:
-                    pass
-        # Yield chunk
-        yield chunk
+    # Collect streamed deltas as they are produced instead of re-parsing each event
+    content_parts = []
+
+    async for event, delta in _generate_sse_events(request, session_id, user_content):
+        if delta:
+            content_parts.append(delta)
+        yield event
 
     # Save accumulated assistant message to database
+    assistant_content = "".join(content_parts)
     if assistant_content:
-        with get_db() as conn:
-            conn.execute(
-                "INSERT INTO messages (session_id, role, content) VALUES (?, ?, ?)",
-                (session_id, 'assistant', assistant_content)
-            )
-            conn.commit()
+        def _save_assistant_message():
+            with get_db() as conn:
+                conn.execute(
+                    "INSERT INTO messages (session_id, role, content, image) VALUES (?, ?, ?, ?)",
+                    (session_id, 'assistant', assistant_content, None)
+                )
+                conn.commit()
+
+        await asyncio.to_thread(_save_assistant_message)
 
 async def handle_chat_text_only(request, user_content):
     """
@@ -214,11 +233,11 @@ async def handle_chat_text_only(request, user_content):
         # Format: "adapter-session-{session_key}"
         user_field = f"adapter-session-{request.session_key}"
 
-        # Debug logging to verify correct format
-
         # Inject system context (project path + rules)
         user_messages = [{"role": "user", "content": user_content}]
-        messages_with_context = context_injector.inject_system_context(
+        # Context lookup hits the database and disk, so keep it off the event loop
+        messages_with_context = await asyncio.to_thread(
+            context_injector.inject_system_context,
             request.session_key,
             user_messages
         )
@@ -233,14 +252,13 @@ async def handle_chat_text_only(request, user_content):
             "Authorization": f"Bearer {CLAWDBOT_TOKEN}",
         }
 
-        async with AsyncClient(timeout=300) as client:
-            response = await client.post(
-                f"{CLAWDBOT_BASE_URL}/v1/chat/completions",
-                json=request_body,
-                headers=headers
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result.get('choices', [{}])[0].get('message', {}).get('content', 'No response from assistant')
+        response = await get_http_client().post(
+            f"{CLAWDBOT_BASE_URL}/v1/chat/completions",
+            json=request_body,
+            headers=headers
+        )
+        response.raise_for_status()
+        result = response.json()
+        return result.get('choices', [{}])[0].get('message', {}).get('content', 'No response from assistant')
     except Exception as e:
         return f"Error: {str(e)}"
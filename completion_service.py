@@ -19,6 +19,18 @@ class CompletionService:
     # Maximum number of messages to prevent abuse
     MAX_MESSAGES = 50
 
+    # Accepted request values (checked on every completion)
+    VALID_PROJECT_TYPES = (
+        "website",
+        "telegrambot",
+        "discordbot",
+        "tradingbot",
+        "scheduler",
+        "custom",
+    )
+    VALID_MODES = ("create", "modify")
+    ALLOWED_ROLES = frozenset(("user", "assistant"))
+
     # Internal system prompt (never sent from client)
     SYSTEM_PROMPT = """You are a senior AI software architect and product strategist. The user is building AI-powered automation projects inside a structured platform.
 
@@ -108,7 +120,7 @@ General Behavior Rules:
             return None
 
         # Only allow user and assistant roles
-        if role not in ["user", "assistant"]:
+        if role not in self.ALLOWED_ROLES:
             return None
 
         # Content must be non-empty
@@ -134,33 +146,45 @@ General Behavior Rules:
         Returns:
             Tuple of (is_valid, error_message)
         """
+        error_msg, _ = self._validate_and_sanitize(project_type, mode, messages)
+        return error_msg is None, error_msg
+
+    def _validate_and_sanitize(
+        self,
+        project_type: str,
+        mode: str,
+        messages: List[Dict[str, str]],
+    ) -> tuple[Optional[str], List[Dict[str, str]]]:
+        """
+        Validate request parameters and sanitize messages in a single pass.
+
+        Args:
+            project_type: Project type from user
+            mode: Operation mode (create/modify)
+            messages: List of chat messages
+
+        Returns:
+            Tuple of (error_message or None, sanitized messages)
+        """
         # Validate project_type
-        valid_project_types = [
-            "website",
-            "telegrambot",
-            "discordbot",
-            "tradingbot",
-            "scheduler",
-            "custom",
-        ]
-        if project_type not in valid_project_types:
+        if project_type not in self.VALID_PROJECT_TYPES:
             return (
-                False,
                 f"Invalid projectType '{project_type}'. Must be one of: "
-                f"{', '.join(valid_project_types)}",
+                f"{', '.join(self.VALID_PROJECT_TYPES)}",
+                [],
             )
 
         # Validate mode
-        if mode not in ["create", "modify"]:
-            return False, f"Invalid mode '{mode}'. Must be either 'create' or 'modify'"
+        if mode not in self.VALID_MODES:
+            return f"Invalid mode '{mode}'. Must be either 'create' or 'modify'", []
 
         # Validate messages array
-        if not messages or len(messages) == 0:
-            return False, "messages array is required and cannot be empty"
+        if not messages:
+            return "messages array is required and cannot be empty", []
 
         # Check message count limit
         if len(messages) > self.MAX_MESSAGES:
-            return False, f"messages array too large (max {self.MAX_MESSAGES})"
+            return f"messages array too large (max {self.MAX_MESSAGES})", []
 
         # Sanitize all messages
         sanitized = []
@@ -170,11 +194,10 @@ General Behavior Rules:
                 sanitized.append(clean)
 
         # Must have at least one user message after sanitization
-        has_user = any(m["role"] == "user" for m in sanitized)
-        if not has_user:
-            return False, "messages array must contain at least one user message"
+        if not any(m["role"] == "user" for m in sanitized):
+            return "messages array must contain at least one user message", []
 
-        return True, None
+        return None, sanitized
 
     async def complete(
         self,
@@ -199,18 +222,11 @@ General Behavior Rules:
         if not self.is_available():
             raise RuntimeError("Completion service not available - GROQ_API_KEY not configured")
 
-        # Validate request
-        is_valid, error_msg = self.validate_request(project_type, mode, messages)
-        if not is_valid:
+        # Validate request and sanitize messages (reject system role, validate structure)
+        error_msg, sanitized_messages = self._validate_and_sanitize(project_type, mode, messages)
+        if error_msg is not None:
             return {"success": False, "error": error_msg}
 
-        # Sanitize messages (reject system role, validate structure)
-        sanitized_messages = []
-        for msg in messages:
-            clean = self.sanitize_message(msg)
-            if clean:
-                sanitized_messages.append(clean)
-
         # Build messages array for Groq
         # First: system prompt
         # Then: sanitized client messages
@@ -97,7 +97,7 @@ class ContextInjector:
 
                     return path
 
-                logger.debug(f"Session {session_key} not found")
+                logger.debug("Session %s not found", session_key)
                 return None
 
         except Exception as e:
@@ -127,7 +127,7 @@ class ContextInjector:
 
             # Check if file exists
             if not os.path.exists(real_path):
-                logger.debug(f"Rule file does not exist: {file_path}")
+                logger.debug("Rule file does not exist: %s", file_path)
                 return None
 
             # Security: Check file size limit
@@ -145,7 +145,7 @@ class ContextInjector:
                     logger.warning(f"Security: Rule content too large, truncating: {file_path}")
                     return content[:RULE_FILE_MAX_SIZE]
 
-                logger.debug(f"Successfully read rule file: {file_path} ({len(content)} chars)")
+                logger.debug("Successfully read rule file: %s (%s chars)", file_path, len(content))
                 return content
 
         except UnicodeDecodeError as e:
@@ -198,7 +198,7 @@ class ContextInjector:
 - When reading files: Check project folder first
 - When using `exec`: Set `workdir` to project folder
 - Never save project files to workspace or other locations"""
-        logger.debug(f"Built project context message: {project_path}")
+        logger.debug("Built project context message: %s", project_path)
 
         return {
             "role": "system",
@@ -230,11 +230,11 @@ class ContextInjector:
             # Verify cache is still valid (files haven't been modified)
             cache_mtime = cached_data.get('mtime', 0)
             if self._are_files_valid(project_path, cache_mtime):
-                logger.debug(f"Using cached rules for: {project_path}")
+                logger.debug("Using cached rules for: %s", project_path)
                 return cached_data['messages']
 
         # Load from disk
-        logger.debug(f"Loading rules from disk: {project_path}")
+        logger.debug("Loading rules from disk: %s", project_path)
         messages = self._load_rules_from_disk(project_path)
 
         # Cache the result
@@ -257,7 +257,7 @@ class ContextInjector:
                     "role": "system",
                     "content": rule_content
                 })
-                logger.debug(f"Loaded rule file: {rule_file}")
+                logger.debug("Loaded rule file: %s", rule_file)
 
         return system_messages
 
@@ -279,16 +279,16 @@ class ContextInjector:
         Returns:
             List of messages with system context prepended, or user_messages if no project context
         """
-        logger.debug(f"Injecting context for session: {session_key}")
+        logger.debug("Injecting context for session: %s", session_key)
 
         # Get project folder path
         project_path = self.get_project_folder_path(session_key)
         if not project_path:
             # No project context available, return user messages as-is
-            logger.debug(f"No project path found for session: {session_key}")
+            logger.debug("No project path found for session: %s", session_key)
             return user_messages
 
-        logger.debug(f"Project path: {project_path}")
+        logger.debug("Project path: %s", project_path)
 
         # Build system messages
         system_messages = []
@@ -302,12 +302,12 @@ class ContextInjector:
         rule_messages = self.load_and_register_rules(project_path)
         system_messages.extend(rule_messages)
 
-        logger.debug(f"Loaded {len(rule_messages)} rule messages")
+        logger.debug("Loaded %s rule messages", len(rule_messages))
 
         # Prepend system messages to user messages
         # This ensures the context is available for the session
         final_messages = system_messages + user_messages
-        logger.debug(f"Final messages count: {len(final_messages)} (system: {len(system_messages)}, user: {len(user_messages)})")
+        logger.debug("Final messages count: %s (system: %s, user: %s)", len(final_messages), len(system_messages), len(user_messages))
 
         return final_messages
 
@@ -316,4 +316,4 @@ class ContextInjector:
         cache_key = self._get_cache_key(project_path)
         if cache_key in self._rule_cache:
             del self._rule_cache[cache_key]
-            logger.debug(f"Invalidated cache for: {project_path}")
+            logger.debug("Invalidated cache for: %s", project_path)
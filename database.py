@@ -4,25 +4,186 @@ Handles schema initialization, migrations, and database connections.
 """
 
 import os
+import queue
 import sqlite3
+import logging
+import threading
 from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
 
 DB_PATH = os.getenv("DB_PATH", "/root/clawd/clawdbot_adapter.db")
 
+# Connection pool sizing
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Prepared statements kept per pooled connection (sqlite3's LRU, keyed by SQL text)
+DB_CACHED_STATEMENTS = int(os.getenv("DB_CACHED_STATEMENTS", "256"))
+
+# Seconds a writer waits on a locked database before "database is locked"
+DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", "30"))
+
+# Raised on constraint violations (e.g. idx_projects_domain); re-exported by database_adapter
+IntegrityError = sqlite3.IntegrityError
+
+# Unique index behind create_project's duplicate-domain check
+DOMAIN_INDEX_NAME = "idx_projects_domain"
+
+# Connection pool (reuses connections and their page cache across requests)
+connection_pool: Optional["SQLiteConnectionPool"] = None
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Open a new SQLite connection configured for pooled use.
+    PRAGMAs are applied once here instead of on every request.
+    """
+    # check_same_thread=False: pooled connections are handed to worker threads
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=DB_BUSY_TIMEOUT,
+        check_same_thread=False,
+        cached_statements=DB_CACHED_STATEMENTS,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe pool of SQLite connections.
+    Mirrors the psycopg2 pool interface (getconn/putconn/closeall)
+    so both database backends are used the same way.
+    """
+
+    def __init__(self, minconn: int, maxconn: int):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.closed = False
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+
+        for _ in range(minconn):
+            self._idle.put(_connect())
+            self._size += 1
+
+    def getconn(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one while below maxconn."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._size < self.maxconn:
+                self._size += 1
+                try:
+                    return _connect()
+                except Exception:
+                    self._size -= 1
+                    raise
+
+        # Pool exhausted: wait for a connection to be returned
+        try:
+            return self._idle.get(timeout=DB_POOL_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(f"Timed out waiting for a database connection (max {self.maxconn})")
+
+    def putconn(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, discarding any uncommitted work."""
+        if self.closed:
+            conn.close()
+            return
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            # Broken connection: drop it instead of handing it out again
+            logger.warning(f"Discarding broken SQLite connection: {e}")
+            conn.close()
+            with self._lock:
+                self._size -= 1
+            return
+
+        self._idle.put(conn)
+
+    def closeall(self) -> None:
+        """Close all idle connections; busy ones are closed when returned."""
+        self.closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._size -= 1
+
+    def status(self) -> Dict[str, Any]:
+        """Pool usage counters."""
+        idle = self._idle.qsize()
+        return {
+            "min": self.minconn,
+            "max": self.maxconn,
+            "size": self._size,
+            "idle": idle,
+            "active": self._size - idle,
+        }
+
+
+def get_connection_pool() -> SQLiteConnectionPool:
+    """
+    Get or create the SQLite connection pool.
+    Returns a thread-safe connection pool.
+    """
+    global connection_pool
+
+    if connection_pool is None:
+        connection_pool = SQLiteConnectionPool(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE)
+        logger.info(f"✓ SQLite connection pool created (db={DB_PATH}, min={DB_POOL_MIN_SIZE}, max={DB_POOL_MAX_SIZE})")
+
+    return connection_pool
+
 
 @contextmanager
 def get_db():
     """
     Database connection context manager.
-    Yields a connection with Row factory for dict-like access.
-    Automatically closes connection on exit.
+    Yields a pooled connection with Row factory for dict-like access.
+    Automatically returns the connection to the pool on exit.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    pool = get_connection_pool()
+    conn = pool.getconn()
     try:
         yield conn
     finally:
-        conn.close()
+        pool.putconn(conn)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Get connection pool usage (active/idle counts)."""
+    if connection_pool is None:
+        return {"backend": "sqlite", "initialized": False}
+    return {"backend": "sqlite", "initialized": True, **connection_pool.status()}
+
+
+def close_pool():
+    """Close all connections in pool."""
+    global connection_pool
+    if connection_pool:
+        connection_pool.closeall()
+        logger.info("✓ SQLite connection pool closed")
+        connection_pool = None
 
 
 def init_schema():
@@ -115,6 +276,18 @@ def init_schema():
         except:
             pass
 
+        # Ensure the domain index exists even when the column predates the migration
+        # (backs the duplicate-domain check in create_project). Legacy rows with
+        # duplicate domains block it; create_project then falls back to a SELECT.
+        try:
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {DOMAIN_INDEX_NAME} ON projects(domain)")
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(
+                f"❌ Could not create unique index {DOMAIN_INDEX_NAME} on projects(domain) "
+                f"(duplicate domains in existing rows?): {e}"
+            )
+
         # Projects table migration: status (for background OpenClaw initialization)
         try:
             conn.execute("ALTER TABLE projects ADD COLUMN status TEXT NOT NULL DEFAULT 'creating'")
@@ -139,6 +312,31 @@ def init_schema():
         except:
             pass
 
+        # Projects table migration: template_id (selected frontend template)
+        try:
+            conn.execute("ALTER TABLE projects ADD COLUMN template_id TEXT")
+            conn.commit()
+            print("✓ Added template_id column")
+        except:
+            pass
+
+        # Projects table migration: error_code (failure reason shown by /status)
+        try:
+            conn.execute("ALTER TABLE projects ADD COLUMN error_code VARCHAR(100)")
+            conn.commit()
+            print("✓ Added error_code column")
+        except:
+            pass
+
+        # Projects table migration: updated_at (set by update_project)
+        # SQLite can't add a column with a CURRENT_TIMESTAMP default, so it starts NULL
+        try:
+            conn.execute("ALTER TABLE projects ADD COLUMN updated_at TIMESTAMP")
+            conn.commit()
+            print("✓ Added updated_at column")
+        except:
+            pass
+
         # Sessions table
         conn.execute("""CREATE TABLE IF NOT EXISTS sessions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -170,4 +368,93 @@ def init_schema():
         except:
             pass
 
+        # Indexes for per-project session listing and per-session message history
+        # (sessions.session_key is already indexed by its UNIQUE constraint)
+        indexes_exist = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_messages_session_created'"
+        ).fetchone()
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_project_archived_created ON sessions(project_id, archived, created_at DESC)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_session_created ON messages(session_id, created_at)")
+        if not indexes_exist:
+            # Refresh planner statistics once so the new indexes get used
+            conn.execute("ANALYZE")
+            print("✓ Added session/message indexes")
+
         conn.commit()
+
+
+def has_domain_index(conn) -> bool:
+    """
+    Check whether the unique projects(domain) index exists.
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        True if duplicate domains are rejected by the index on INSERT
+    """
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+        (DOMAIN_INDEX_NAME,)
+    ).fetchone()
+    return row is not None
+
+
+def is_domain_conflict(error: Exception) -> bool:
+    """
+    Check whether an IntegrityError was raised by the unique domain index.
+
+    SQLite names the indexed columns rather than the index:
+    "UNIQUE constraint failed: projects.domain". The extended error code is
+    checked too where available (Python 3.11+ exposes sqlite_errorcode).
+    """
+    if str(error) != "UNIQUE constraint failed: projects.domain":
+        return False
+    error_code = getattr(error, "sqlite_errorcode", None)
+    unique_code = getattr(sqlite3, "SQLITE_CONSTRAINT_UNIQUE", None)
+    return error_code is None or unique_code is None or error_code == unique_code
+
+
+def delete_project_rows(conn, project_id: int) -> list:
+    """
+    Delete a project together with its sessions and messages (caller commits).
+
+    Session keys come back from the DELETE itself via RETURNING, so no
+    separate lookup query is needed.
+
+    Args:
+        conn: Open database connection
+        project_id: Project ID
+
+    Returns:
+        session_keys of the deleted sessions
+    """
+    conn.execute("DELETE FROM messages WHERE session_id IN (SELECT id FROM sessions WHERE project_id = ?)", (project_id,))
+    rows = conn.execute("DELETE FROM sessions WHERE project_id = ? RETURNING session_key", (project_id,)).fetchall()
+    conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+    return [row["session_key"] for row in rows]
+
+
+def delete_session_rows(conn, session_id: int, project_id: Optional[int] = None) -> Optional[str]:
+    """
+    Delete a session and its messages (caller commits).
+
+    Args:
+        conn: Open database connection
+        session_id: Session ID
+        project_id: Only delete the session if it belongs to this project (optional)
+
+    Returns:
+        session_key of the deleted session, or None if no session matched
+    """
+    if project_id is None:
+        row = conn.execute("DELETE FROM sessions WHERE id = ? RETURNING session_key", (session_id,)).fetchone()
+    else:
+        row = conn.execute(
+            "DELETE FROM sessions WHERE id = ? AND project_id = ? RETURNING session_key",
+            (session_id, project_id)
+        ).fetchone()
+    if not row:
+        return None
+    conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+    return row["session_key"]
@@ -22,14 +22,30 @@ if USE_POSTGRES:
         validate_project_database_deletion,
         delete_project_database,
         test_connection,
-        close_pool
+        get_pool_status,
+        close_pool,
+        delete_project_rows,
+        delete_session_rows,
+        has_domain_index,
+        is_domain_conflict,
+        IntegrityError
     )
 else:
     logger.info("Using SQLite database backend")
     from database import (
         get_db,
-        init_schema
+        init_schema,
+        get_pool_status,
+        close_pool,
+        delete_project_rows,
+        delete_session_rows,
+        has_domain_index,
+        is_domain_conflict,
+        IntegrityError
     )
+
+    # Resolved once; used by the SQLite fallbacks below
+    DB_PATH = os.getenv("DB_PATH", "/root/clawd-backend/clawdbot_adapter.db")
     
     # PostgreSQL-specific functions not available in SQLite mode
     def is_master_database(db_name: str) -> bool:
@@ -44,7 +60,6 @@ else:
     def delete_project_database(project_name: str, force: bool = False):
         """SQLite deletion (simplified)."""
         import sqlite3
-        DB_PATH = os.getenv("DB_PATH", "/root/clawd-backend/clawdbot_adapter.db")
         db_name = f"{project_name.replace('-', '_')}_db"
         
         try:
@@ -61,7 +76,6 @@ else:
     def test_connection():
         """Test SQLite connection."""
         import sqlite3
-        DB_PATH = os.getenv("DB_PATH", "/root/clawd-backend/clawdbot_adapter.db")
         try:
             conn = sqlite3.connect(DB_PATH)
             conn.execute("SELECT 1")
@@ -80,10 +94,6 @@ else:
                 "database": DB_PATH,
                 "backend": "sqlite"
             }
-    
-    def close_pool():
-        """SQLite has no connection pool."""
-        logger.debug("close_pool() no-op in SQLite mode")
 
 
 # Export all public functions
@@ -94,11 +104,36 @@ __all__ = [
     'validate_project_database_deletion',
     'delete_project_database',
     'test_connection',
+    'get_pool_status',
     'close_pool',
+    'delete_project_rows',
+    'delete_session_rows',
+    'has_domain_index',
+    'is_domain_conflict',
+    'IntegrityError',
     'USE_POSTGRES'
 ]
 
 
+# Backend configuration is fixed at import; build the info dict once
+if USE_POSTGRES:
+    from database_postgres import DB_HOST, DB_PORT, DB_NAME, DB_USER
+    _DATABASE_INFO = {
+        "backend": "postgresql",
+        "host": DB_HOST,
+        "port": DB_PORT,
+        "database": DB_NAME,
+        "user": DB_USER,
+        "connection_pool": True
+    }
+else:
+    _DATABASE_INFO = {
+        "backend": "sqlite",
+        "database": DB_PATH,
+        "connection_pool": True
+    }
+
+
 def get_database_info() -> dict:
     """
     Get current database configuration info.
@@ -106,25 +141,7 @@ def get_database_info() -> dict:
     Returns:
         Dict with database backend and connection details
     """
-    if USE_POSTGRES:
-        from database_postgres import (
-            DB_HOST, DB_PORT, DB_NAME, DB_USER
-        )
-        return {
-            "backend": "postgresql",
-            "host": DB_HOST,
-            "port": DB_PORT,
-            "database": DB_NAME,
-            "user": DB_USER,
-            "connection_pool": True
-        }
-    else:
-        DB_PATH = os.getenv("DB_PATH", "/root/clawd-backend/clawdbot_adapter.db")
-        return {
-            "backend": "sqlite",
-            "database": DB_PATH,
-            "connection_pool": False
-        }
+    return dict(_DATABASE_INFO)
 
 
 def require_postgres() -> bool:
@@ -2,6 +2,7 @@ import os
 import psycopg2
 from psycopg2 import pool, sql
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
 import logging
 
@@ -14,6 +15,12 @@ DB_NAME = os.getenv("DB_NAME", "dreampilot")
 DB_USER = os.getenv("DB_USER", "admin")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "StrongAdminPass123")
 
+# Raised on constraint violations (e.g. idx_projects_domain); re-exported by database_adapter
+IntegrityError = psycopg2.IntegrityError
+
+# Unique index behind create_project's duplicate-domain check
+DOMAIN_INDEX_NAME = "idx_projects_domain"
+
 # Connection pool (for better performance)
 connection_pool: Optional[pool.ThreadedConnectionPool] = None
 
@@ -59,6 +66,12 @@ def get_connection_pool() -> pool.ThreadedConnectionPool:
     return connection_pool
 
 
+@lru_cache(maxsize=256)
+def _to_postgres_placeholders(query: str) -> str:
+    """Convert SQLite-style ? placeholders to PostgreSQL %s (memoized per query string)."""
+    return query.replace('?', '%s')
+
+
 class CursorAsConnection:
     """
     Wrapper to make a psycopg2 cursor behave like a SQLite connection.
@@ -74,11 +87,7 @@ class CursorAsConnection:
         Execute query through cursor and return self for chaining.
         Converts SQLite-style '?' placeholders to PostgreSQL '%s'.
         """
-        # Convert SQLite-style ? placeholders to PostgreSQL %s
-        postgres_query = query.replace('?', '%s')
-        if query != postgres_query:
-            logger.debug(f"Converted query placeholders: '?' → '%s'")
-        self._cursor.execute(postgres_query, params or ())
+        self._cursor.execute(_to_postgres_placeholders(query), params or ())
         return self
 
     def executemany(self, query, params):
@@ -86,9 +95,7 @@ class CursorAsConnection:
         Execute many queries through cursor.
         Converts SQLite-style '?' placeholders to PostgreSQL '%s'.
         """
-        # Convert SQLite-style ? placeholders to PostgreSQL %s
-        postgres_query = query.replace('?', '%s')
-        return self._cursor.executemany(postgres_query, params)
+        return self._cursor.executemany(_to_postgres_placeholders(query), params)
 
     def fetchall(self):
         """Fetch all results."""
@@ -245,6 +252,19 @@ def init_schema():
                 logger.info("✓ Added domain column and unique index")
             _run_migration(migrate_domain)
 
+            # Ensure the domain index exists even when the column predates the migration
+            # (backs the duplicate-domain check in create_project). Legacy rows with
+            # duplicate domains block it; create_project then falls back to a SELECT.
+            try:
+                cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {DOMAIN_INDEX_NAME} ON projects(domain)")
+                conn.commit()
+            except psycopg2.Error as e:
+                conn.rollback()
+                logger.error(
+                    f"❌ Could not create unique index {DOMAIN_INDEX_NAME} on projects(domain) "
+                    f"(duplicate domains in existing rows?): {e}"
+                )
+
             def migrate_status():
                 cur.execute("ALTER TABLE projects ADD COLUMN status TEXT NOT NULL DEFAULT 'creating'")
                 logger.info("✓ Added status column with default 'creating'")
@@ -275,6 +295,16 @@ def init_schema():
                 logger.info("✓ Added error_code column for detailed failure reasons")
             _run_migration(migrate_error_code)
 
+            def migrate_template_id():
+                cur.execute("ALTER TABLE projects ADD COLUMN template_id TEXT")
+                logger.info("✓ Added template_id column for selected frontend template")
+            _run_migration(migrate_template_id)
+
+            def migrate_updated_at():
+                cur.execute("ALTER TABLE projects ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+                logger.info("✓ Added updated_at column for project edits")
+            _run_migration(migrate_updated_at)
+
             # Sessions table
             cur.execute("""CREATE TABLE IF NOT EXISTS sessions (
                 id SERIAL PRIMARY KEY,
@@ -306,6 +336,14 @@ def init_schema():
                 cur.execute("ALTER TABLE messages ADD COLUMN image TEXT")
             _run_migration(migrate_image)
 
+            # Indexes for per-project session listing and per-session message history
+            # (sessions.session_key is already indexed by its UNIQUE constraint)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_project_archived_created ON sessions(project_id, archived, created_at DESC)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_messages_session_created ON messages(session_id, created_at)")
+            cur.execute("ANALYZE sessions")
+            cur.execute("ANALYZE messages")
+            conn.commit()
+
             logger.info("✓ Database schema initialized")
     finally:
         pool.putconn(conn)
@@ -444,6 +482,23 @@ def test_connection() -> Dict[str, Any]:
         }
 
 
+def get_pool_status() -> Dict[str, Any]:
+    """Get connection pool usage (active/idle counts)."""
+    if connection_pool is None:
+        return {"backend": "postgresql", "initialized": False}
+    idle = len(connection_pool._pool)
+    active = len(connection_pool._used)
+    return {
+        "backend": "postgresql",
+        "initialized": True,
+        "min": connection_pool.minconn,
+        "max": connection_pool.maxconn,
+        "size": idle + active,
+        "idle": idle,
+        "active": active,
+    }
+
+
 def close_pool():
     """Close all connections in pool."""
     global connection_pool
@@ -451,3 +506,78 @@ def close_pool():
         connection_pool.closeall()
         logger.info("✓ PostgreSQL connection pool closed")
         connection_pool = None
+
+
+def has_domain_index(conn) -> bool:
+    """
+    Check whether the unique projects(domain) index exists.
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        True if duplicate domains are rejected by the index on INSERT
+    """
+    row = conn.execute(
+        "SELECT 1 FROM pg_indexes WHERE tablename = 'projects' AND indexname = ?",
+        (DOMAIN_INDEX_NAME,)
+    ).fetchone()
+    return row is not None
+
+
+def is_domain_conflict(error: Exception) -> bool:
+    """Check whether an IntegrityError was raised by the unique domain index."""
+    diag = getattr(error, "diag", None)
+    return diag is not None and diag.constraint_name == DOMAIN_INDEX_NAME
+
+
+def delete_project_rows(conn, project_id: int) -> List[str]:
+    """
+    Delete a project together with its sessions and messages (caller commits).
+
+    Runs as a single statement: data-modifying CTEs delete the sessions and
+    their messages and hand back the deleted session keys.
+
+    Args:
+        conn: Open database connection
+        project_id: Project ID
+
+    Returns:
+        session_keys of the deleted sessions
+    """
+    rows = conn.execute(
+        """WITH deleted_sessions AS (
+               DELETE FROM sessions WHERE project_id = ? RETURNING id, session_key
+           ), deleted_messages AS (
+               DELETE FROM messages WHERE session_id IN (SELECT id FROM deleted_sessions)
+           ), deleted_project AS (
+               DELETE FROM projects WHERE id = ?
+           )
+           SELECT session_key FROM deleted_sessions""",
+        (project_id, project_id)
+    ).fetchall()
+    return [row["session_key"] for row in rows]
+
+
+def delete_session_rows(conn, session_id: int, project_id: Optional[int] = None) -> Optional[str]:
+    """
+    Delete a session and its messages in a single statement (caller commits).
+
+    Args:
+        conn: Open database connection
+        session_id: Session ID
+        project_id: Only delete the session if it belongs to this project (optional)
+
+    Returns:
+        session_key of the deleted session, or None if no session matched
+    """
+    row = conn.execute(
+        """WITH deleted_session AS (
+               DELETE FROM sessions WHERE id = ? AND (? IS NULL OR project_id = ?) RETURNING id, session_key
+           ), deleted_messages AS (
+               DELETE FROM messages WHERE session_id IN (SELECT id FROM deleted_session)
+           )
+           SELECT session_key FROM deleted_session""",
+        (session_id, project_id, project_id)
+    ).fetchone()
+    return row["session_key"] if row else None
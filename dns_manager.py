@@ -13,6 +13,7 @@ Supports:
 
 import os
 import json
+import functools
 import logging
 from pathlib import Path
 
@@ -159,12 +160,26 @@ class HostingerDNSAPI:
             domain: Base domain (e.g., "dreambigwithai.com")
             subdomain: Subdomain name to delete (e.g., "cryptoprice")
 
+        Returns:
+            Dict with success status and message
+        """
+        return self.delete_a_records(domain, [subdomain])
+
+    def delete_a_records(self, domain: str, subdomains: list) -> dict:
+        """
+        Delete several subdomains' DNS records with one zone fetch and one zone write.
+
+        Args:
+            domain: Base domain (e.g., "dreambigwithai.com")
+            subdomains: Subdomain names to delete (e.g., ["cryptoprice", "cryptoprice-api"])
+
         Returns:
             Dict with success status and message
         """
         try:
             url = f"{self.base_url}/zones/{domain}"
-            full_domain = f"{subdomain}.{domain}"
+            full_domain = ", ".join(f"{subdomain}.{domain}" for subdomain in subdomains)
+            names_to_delete = {subdomain.lower() for subdomain in subdomains}
 
             # First, get all current records
             get_response = self.session.get(url, timeout=30)
@@ -176,9 +191,9 @@ class HostingerDNSAPI:
 
             current_records = get_response.json()
 
-            # Filter out the subdomain record we want to delete
-            # Keep all records except those matching subdomain name
-            updated_records = [r for r in current_records if r.get("name", "").lower() != subdomain.lower()]
+            # Filter out the subdomain records we want to delete
+            # Keep all records except those matching a subdomain name
+            updated_records = [r for r in current_records if r.get("name", "").lower() not in names_to_delete]
 
             # PUT the updated records back (wrapped in zone array with overwrite)
             record_data = {
@@ -339,6 +354,12 @@ def get_api_token() -> str:
     return api_token
 
 
+@functools.lru_cache(maxsize=1)
+def _get_client(api_token: str) -> HostingerDNSAPI:
+    """Get a shared API client per token, reusing its keep-alive HTTPS session across calls."""
+    return HostingerDNSAPI(api_token)
+
+
 def list_dns_records(domain: str) -> dict:
     """
     List all current DNS records for a domain.
@@ -350,7 +371,7 @@ def list_dns_records(domain: str) -> dict:
         Dict with records list or error
     """
     api_token = get_api_token()
-    client = HostingerDNSAPI(api_token)
+    client = _get_client(api_token)
     return client.list_dns_records(domain)
 
 
@@ -366,7 +387,7 @@ def check_subdomain_exists(domain: str, subdomain: str) -> dict:
         Dict with exists bool, current IP, record type, and details
     """
     api_token = get_api_token()
-    client = HostingerDNSAPI(api_token)
+    client = _get_client(api_token)
     return client.check_subdomain_exists(domain, subdomain)
 
 
@@ -384,7 +405,7 @@ def create_a_record(domain: str, subdomain: str, ip: str, ttl: int = 14400) -> d
         Dict with success status and message
     """
     api_token = get_api_token()
-    client = HostingerDNSAPI(api_token)
+    client = _get_client(api_token)
     return client.create_a_record(domain, subdomain, ip, ttl)
 
 
@@ -400,5 +421,21 @@ def delete_a_record(domain: str, subdomain: str) -> dict:
         Dict with success status and message
     """
     api_token = get_api_token()
-    client = HostingerDNSAPI(api_token)
+    client = _get_client(api_token)
     return client.delete_a_record(domain, subdomain)
+
+
+def delete_a_records(domain: str, subdomains: list) -> dict:
+    """
+    Delete several subdomains' DNS records in one zone update.
+
+    Args:
+        domain: Base domain (e.g., "dreambigwithai.com")
+        subdomains: Subdomain names to delete (e.g., ["cryptoprice", "cryptoprice-api"])
+
+    Returns:
+        Dict with success status and message
+    """
+    api_token = get_api_token()
+    client = _get_client(api_token)
+    return client.delete_a_records(domain, subdomains)
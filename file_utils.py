@@ -101,20 +101,20 @@ class FileUtils:
         Returns:
             List of file nodes (files and folders)
         """
-        base = Path(base_path)
-
-        if not base.exists():
+        # scandir yields cached file types, so each entry costs at most one stat
+        try:
+            with os.scandir(base_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except FileNotFoundError:
             return []
 
         nodes = []
 
-        for item in sorted(base.iterdir()):
+        for item in entries:
             # Skip hidden files and directories
             if item.name.startswith('.'):
                 continue
 
-            relative_path = item.relative_to(base)
-
             if item.is_file():
                 try:
                     size = item.stat().st_size
@@ -124,16 +124,18 @@ class FileUtils:
                 nodes.append({
                     'type': 'file',
                     'name': item.name,
-                    'path': str(relative_path).replace(os.sep, '/'),
+                    'path': item.name,
                     'size': size,
+                    'children': None,
                 })
             elif item.is_dir():
-                children = FileUtils.build_file_tree(str(item))
+                children = FileUtils.build_file_tree(item.path)
                 if children:  # Only include non-empty directories
                     nodes.append({
                         'type': 'folder',
                         'name': item.name,
-                        'path': str(relative_path).replace(os.sep, '/'),
+                        'path': item.name,
+                        'size': None,
                         'children': children,
                     })
 
@@ -6,6 +6,8 @@ Uses official Groq Python SDK.
 """
 
 import os
+import asyncio
+import functools
 import logging
 from typing import Optional, List
 
@@ -17,6 +19,17 @@ logger = logging.getLogger(__name__)
 _GROQ_API_KEY_LOGGED = False
 
 
+@functools.lru_cache(maxsize=1)
+def _get_client(api_key: str) -> Groq:
+    """
+    Get the shared Groq client for an API key.
+
+    The SDK client keeps a pooled keep-alive HTTP connection, so sharing it
+    across GroqService instances skips the TCP/TLS setup on every completion.
+    """
+    return Groq(api_key=api_key)
+
+
 class GroqService:
     """Service for interacting with Groq API."""
 
@@ -39,8 +52,8 @@ class GroqService:
                 _GROQ_API_KEY_LOGGED = True
             raise ValueError("GROQ_API_KEY is not configured")
 
-        # Initialize Groq client
-        self.client = Groq(api_key=self.api_key)
+        # Shared Groq client (pooled connections reused across instances)
+        self.client = _get_client(self.api_key)
 
     async def generate_chat_completion(
         self,
@@ -67,8 +80,9 @@ class GroqService:
             raise ValueError("GROQ_API_KEY is not configured")
 
         try:
-            # Use Groq SDK to create completion
-            completion = self.client.chat.completions.create(
+            # The SDK call is blocking; run it off the event loop
+            completion = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model=self.model,
                 messages=messages,
                 temperature=temperature or self.DEFAULT_TEMPERATURE,
@@ -0,0 +1,50 @@
+"""
+Shared HTTP client for Clawd Backend.
+Reuses keep-alive connections to the OpenClaw gateway across chat requests.
+"""
+
+import os
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = float(os.getenv("CLAWDBOT_TIMEOUT", "300"))
+# Fail fast when the gateway is down instead of holding the request for HTTP_TIMEOUT
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+
+# Shared client (created on first use, closed on application shutdown)
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the shared AsyncClient.
+    Returns a client with a pooled, keep-alive connection set.
+    """
+    global http_client
+
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+        logger.info(f"✓ Shared HTTP client created (max_connections={HTTP_MAX_CONNECTIONS})")
+
+    return http_client
+
+
+async def close_http_client():
+    """Close the shared client and its pooled connections."""
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        logger.info("✓ Shared HTTP client closed")
+        http_client = None
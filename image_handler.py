@@ -4,10 +4,19 @@ Image handling utilities for clawd backend.
 Saves base64 images to public directory and workspace for agent access.
 """
 import os
-import base64
-import httpx
+import asyncio
+import logging
 from datetime import datetime
+
+try:
+    # SIMD-accelerated base64 (drop-in for the stdlib API)
+    import pybase64 as base64
+except ImportError:
+    import base64
 from context_injector import ContextInjector
+from http_client import get_http_client
+
+logger = logging.getLogger(__name__)
 
 # Configuration
 IMAGES_DIR = "/root/clawd/public/images"
@@ -48,7 +57,7 @@ def save_base64_image(base64_data: str, session_id: int) -> tuple:
     try:
         # Extract base64 data (remove data URL prefix if present)
         if base64_data.startswith('data:'):
-            base64_data = base64_data.split(',')[1]  # Get data part after prefix
+            base64_data = base64_data.partition(',')[2]  # Get data part after prefix
 
         image_data = base64.b64decode(base64_data)
 
@@ -61,12 +70,10 @@ def save_base64_image(base64_data: str, session_id: int) -> tuple:
             f.write(image_data)
 
         http_url = f"{IMAGES_BASE_URL}/{filename}"
-        print(f"Image saved to public: {public_filepath}")
-        print(f"Image saved to workspace: {workspace_path}")
-        print(f"Accessible at: {http_url}")
+        logger.info(f"Image saved to {public_filepath} and {workspace_path} ({http_url})")
         return (public_filepath, workspace_path, http_url)
     except Exception as e:
-        print(f"Error saving image: {e}")
+        logger.error(f"Error saving image: {e}")
         raise
 
 def delete_image(filepath: str) -> bool:
@@ -82,11 +89,11 @@ def delete_image(filepath: str) -> bool:
     try:
         if os.path.exists(filepath):
             os.remove(filepath)
-            print(f"Image deleted from public: {filepath}")
+            logger.info(f"Image deleted from public: {filepath}")
             return True
         return False
     except Exception as e:
-        print(f"Error deleting image: {e}")
+        logger.error(f"Error deleting image: {e}")
         return False
 
 async def call_chat_completion_with_image(workspace_image_path: str, session_key: str, prompt: str) -> dict:
@@ -115,18 +122,18 @@ async def call_chat_completion_with_image(workspace_image_path: str, session_key
             "content": f"{prompt}\n\n[Image: {image_filename}]"
         }
     ]
-    messages_with_context = context_injector.inject_system_context(
+    # Context lookup hits the database and disk, so keep it off the event loop
+    messages_with_context = await asyncio.to_thread(
+        context_injector.inject_system_context,
         session_key,
         user_messages
     )
 
-    print(f"[DEBUG] Sending request to completion API:")
-    print(f"[DEBUG]   URL: {CHAT_COMPLETION_API_URL}/v1/chat/completions")
-    print(f"[DEBUG]   Original session_key: {session_key}")
-    print(f"[DEBUG]   Sending to OpenClaw with 'user' field: {user_field}")
-    print(f"[DEBUG]   Workspace image path: {workspace_image_path}")
-    print(f"[DEBUG]   Image filename: {image_filename}")
-    print(f"[DEBUG]   Injected system context for session {session_key}")
+    # Deferred %-formatting: skipped entirely unless DEBUG is enabled
+    logger.debug(
+        "Sending image chat to %s/v1/chat/completions (session_key=%s, user=%s, image=%s)",
+        CHAT_COMPLETION_API_URL, session_key, user_field, workspace_image_path
+    )
 
     request_body = {
         "model": "agent:main",
@@ -139,19 +146,19 @@ async def call_chat_completion_with_image(workspace_image_path: str, session_key
     }
 
     try:
-        # Use httpx module-level import from app.py
-        client = httpx.AsyncClient(timeout=300)
-        response = await client.post(
+        # Shared client reuses pooled connections to the gateway
+        response = await get_http_client().post(
             f"{CHAT_COMPLETION_API_URL}/v1/chat/completions",
             json=request_body,
             headers=headers
         )
-        print(f"[DEBUG] Response status: {response.status_code}")
         response.raise_for_status()
         result = response.json()
-        print(f"[DEBUG] Response content: {result.get('choices', [{}])[0].get('message', {}).get('content', '')[:200]}...")
-        print(f"Chat completion API called successfully with workspace image: {workspace_image_path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            content = result.get('choices', [{}])[0].get('message', {}).get('content', '')
+            logger.debug("Image chat response %s: %.200s...", response.status_code, content)
+        logger.info(f"Chat completion API called successfully with workspace image: {workspace_image_path}")
         return result
     except Exception as e:
-        print(f"Error calling chat completion API: {e}")
+        logger.error(f"Error calling chat completion API: {e}")
         raise
@@ -6,7 +6,7 @@ Handles DNS record creation and deletion for DreamPilot projects using local DNS
 
 import os
 import logging
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
 # Configure logging
@@ -132,6 +132,42 @@ class DNSProvisioner:
             logger.error(f"Failed to delete A record: {e}")
             return False
 
+    def delete_a_records(self, subdomains: List[str], domain: str = None) -> bool:
+        """
+        Delete A records for several subdomains in one zone update.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.dns_available:
+            logger.warning(f"  Skipping DNS A record deletion (DNS manager not available)")
+            for subdomain in subdomains:
+                logger.warning(f"  Manually delete A record: {subdomain}.{BASE_DOMAIN}")
+            return False
+
+        try:
+            if not domain:
+                domain = BASE_DOMAIN
+
+            names = ", ".join(f"{subdomain}.{domain}" for subdomain in subdomains)
+            logger.info(f"Deleting A records: {names}")
+
+            # One zone fetch + one zone write for all subdomains
+            result = self.dns_manager.delete_a_records(domain, subdomains)
+
+            if result.get("success"):
+                logger.info(f"✓ A records deleted: {names}")
+                logger.info(f"  Note: DNS propagation takes 5-60 minutes")
+                return True
+            else:
+                logger.error(f"Failed to delete A records:")
+                logger.error(f"  Error: {result.get('error')}")
+                return False
+
+        except Exception as e:
+            logger.error(f"Failed to delete A records: {e}")
+            return False
+
     def provision_project_dns(self, domain: str, project_name: str = "project") -> Dict[str, bool]:
         """
         Provision DNS records for a project (frontend + backend).
@@ -308,6 +344,17 @@ def delete_a_record(subdomain: str, domain: str = None) -> bool:
     return provisioner.delete_a_record(subdomain, domain)
 
 
+def delete_a_records(subdomains: List[str], domain: str = None) -> bool:
+    """
+    Delete A records for several subdomains in one zone update (convenience function).
+
+    Returns:
+        True if successful, False otherwise
+    """
+    provisioner = DNSProvisioner()
+    return provisioner.delete_a_records(subdomains, domain)
+
+
 def provision_project_dns(domain: str, project_name: str = "project") -> Dict[str, bool]:
     """
     Provision DNS records for a project (convenience function).
@@ -11,4 +11,4 @@ source venv/bin/activate
 export DB_PATH="/root/clawd-backend/clawdbot_adapter.db"
 
 # Start the FastAPI application on development port
-exec venv/bin/uvicorn app:app --host 0.0.0.0 --port 8001
+exec venv/bin/uvicorn app:app --host 0.0.0.0 --port 8001 --loop uvloop --http httptools
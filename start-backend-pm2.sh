@@ -3,4 +3,4 @@
 
 cd /root/clawd-backend
 source venv/bin/activate
-exec python3 -m uvicorn app:app --host 0.0.0.0 --port 8002
+exec python3 -m uvicorn app:app --host 0.0.0.0 --port 8002 --loop uvloop --http httptools
@@ -32,4 +32,4 @@ else
 fi
 
 # Start the FastAPI application
-exec venv/bin/uvicorn app:app --host 0.0.0.0 --port 8002
+exec venv/bin/uvicorn app:app --host 0.0.0.0 --port 8002 --loop uvloop --http httptools
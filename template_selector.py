@@ -44,6 +44,8 @@ Available templates will be provided in the user message with their:
         """Initialize template selector."""
         self.groq_service: Optional[GroqService] = None
         self.template_registry: Optional[Dict[str, Any]] = None
+        # Registry templates keyed by id (first entry wins, as in a linear scan)
+        self.templates_by_id: Dict[str, Dict[str, Any]] = {}
         self._initialize()
 
     def _initialize(self) -> None:
@@ -62,7 +64,10 @@ Available templates will be provided in the user message with their:
             # Load template registry
             self.template_registry = self._load_registry()
             if self.template_registry:
-                logger.info(f"Template selector: Loaded {len(self.template_registry.get('templates', []))} templates")
+                templates = self.template_registry.get("templates", [])
+                for template in templates:
+                    self.templates_by_id.setdefault(template.get("id"), template)
+                logger.info(f"Template selector: Loaded {len(templates)} templates")
 
         except Exception as e:
             if not _TEMPLATE_SELECTOR_ERROR_LOGGED:
@@ -181,7 +186,7 @@ Select the most suitable template ID for this project."""
             logger.info(f"Groq selected template: {template_id}")
 
             # Find template in registry
-            template = self._find_template_by_id(template_id)
+            template = self.find_template_by_id(template_id)
 
             if template:
                 return {
@@ -231,9 +236,9 @@ Select the most suitable template ID for this project."""
 
         return "\n".join(templates_info)
 
-    def _find_template_by_id(self, template_id: str) -> Optional[Dict[str, Any]]:
+    def find_template_by_id(self, template_id: str) -> Optional[Dict[str, Any]]:
         """
-        Find template in registry by ID.
+        Find template in registry by ID (dict lookup).
 
         Args:
             template_id: Template ID to find
@@ -241,14 +246,7 @@ Select the most suitable template ID for this project."""
         Returns:
             Template dict or None if not found
         """
-        if not self.template_registry:
-            return None
-
-        for template in self.template_registry.get("templates", []):
-            if template.get("id") == template_id:
-                return template
-
-        return None
+        return self.templates_by_id.get(template_id)
 
     def _get_fallback_template(self) -> Optional[Dict[str, Any]]:
         """
@@ -262,7 +260,7 @@ Select the most suitable template ID for this project."""
 
         # Try to get default fallback from registry
         fallback_id = self.template_registry.get("default_fallback", "saas")
-        return self._find_template_by_id(fallback_id)
+        return self.find_template_by_id(fallback_id)
 
     def list_templates(self) -> Dict[str, Any]:
         """